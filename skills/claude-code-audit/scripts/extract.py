@@ -47,9 +47,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import sys
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -101,15 +103,11 @@ NEGATION_RE = compile_any(NEGATION_PATTERNS)
 FRUSTRATION_RE = compile_any(FRUSTRATION_PATTERNS)
 CORRECTION_RE = compile_any(CORRECTION_PATTERNS)
 SLASH_RE = re.compile(r"(?:^|\s)(/[a-z][a-z0-9:_-]+)", re.IGNORECASE)
+COMMAND_WRAPPER_PREFIXES = ("<local-command", "<command-", "<bash-input>", "<bash-stdout>")
 
 
 def is_command_wrapper(text: str) -> bool:
-    return (
-        text.startswith("<local-command")
-        or text.startswith("<command-")
-        or text.startswith("<bash-input>")
-        or text.startswith("<bash-stdout>")
-    )
+    return text.startswith(COMMAND_WRAPPER_PREFIXES)
 
 
 def extract_from_session(path: Path) -> dict:
@@ -138,8 +136,7 @@ def extract_from_session(path: Path) -> dict:
 
     with path.open("r", encoding="utf-8") as f:
         for raw in f:
-            raw = raw.strip()
-            if not raw:
+            if raw.isspace():
                 continue
             try:
                 obj = json.loads(raw)
@@ -183,7 +180,7 @@ def extract_from_session(path: Path) -> dict:
                     for c in content:
                         if c.get("type") == "tool_result":
                             tool_result_found = True
-                            if c.get("is_error"):
+                            if c.get("is_error") and len(tool_errors) < 30:
                                 tool_errors.append(
                                     {
                                         "idx": tool_idx,
@@ -246,7 +243,8 @@ def extract_from_session(path: Path) -> dict:
                         if c.get("type") == "tool_use":
                             name = c.get("name", "unknown")
                             tool_counts[name] += 1
-                            tool_sequence.append(name)
+                            if len(tool_sequence) < 200:
+                                tool_sequence.append(name)
                             tool_idx += 1
                         elif c.get("type") == "text":
                             text = c.get("text", "")
@@ -293,8 +291,8 @@ def extract_from_session(path: Path) -> dict:
         "version": version,
         "git_branch": git_branch,
         "tool_counts": dict(tool_counts),
-        "tool_sequence": tool_sequence[:200],
-        "tool_errors": tool_errors[:30],
+        "tool_sequence": tool_sequence,
+        "tool_errors": tool_errors,
         "user_prompts": user_prompts,
         "slash_commands": slash_commands,
         "skill_invocations": skill_invocations,
@@ -310,25 +308,40 @@ def extract_from_session(path: Path) -> dict:
     }
 
 
-def do_extract(sample_path: Path, out_dir: Path) -> None:
+def do_extract(sample_path: Path, out_dir: Path, jobs: int | None = None) -> None:
     sample = json.loads(sample_path.read_text())
     records = sample.get("sample", sample) if isinstance(sample, dict) else sample
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    wrote = 0
-    for rec in records:
-        spath = Path(rec["path"])
-        if not spath.exists():
+    def write_result(spath: Path, future: Future | None) -> bool:
+        if future is None:
             print(f"warn: missing {spath}", file=sys.stderr)
-            continue
+            return False
         try:
-            data = extract_from_session(spath)
+            data = future.result()
         except Exception as e:
             print(f"error: extracting {spath}: {e}", file=sys.stderr)
-            continue
+            return False
         out = out_dir / f"{data['session_id']}.json"
         out.write_text(json.dumps(data, indent=2))
-        wrote += 1
+        return True
+
+    # Sessions are independent and parsing is CPU-bound, so fan out across
+    # processes. Only a bounded window is in flight and it is drained in sample
+    # order, so output and warn/error lines keep their order and at most a
+    # window's worth of finished results waits in memory.
+    window = 2 * (jobs or os.cpu_count() or 1)
+    wrote = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: deque[tuple[Path, Future | None]] = deque()
+        for rec in records:
+            spath = Path(rec["path"])
+            future = pool.submit(extract_from_session, spath) if spath.exists() else None
+            pending.append((spath, future))
+            if len(pending) >= window:
+                wrote += write_result(*pending.popleft())
+        while pending:
+            wrote += write_result(*pending.popleft())
 
     print(f"extracted {wrote} sessions to {out_dir}")
 
@@ -369,18 +382,24 @@ def do_aggregate(extracted_dir: Path, out_path: Path) -> None:
             s = json.loads(fp.read_text())
         except json.JSONDecodeError:
             continue
+        session_tool_counts = s.get("tool_counts") or {}
+        session_tool_uses = sum(session_tool_counts.values())
+        session_errors = len(s.get("tool_errors") or [])
+        session_corrections = len(s.get("correction_markers") or [])
+        session_duration = s.get("duration_s") or 0
+
         total_sessions += 1
         total_user_prompts += len(s.get("user_prompts", []))
-        total_tool_uses += sum(s.get("tool_counts", {}).values())
+        total_tool_uses += session_tool_uses
         total_tokens_in += s.get("input_tokens") or 0
         total_tokens_out += s.get("output_tokens") or 0
-        total_errors += len(s.get("tool_errors", []))
+        total_errors += session_errors
         total_interrupts += s.get("interrupts") or 0
-        total_duration += s.get("duration_s") or 0
-        total_corrections += len(s.get("correction_markers", []))
+        total_duration += session_duration
+        total_corrections += session_corrections
         total_friction += len(s.get("friction_markers", []))
 
-        for name, count in (s.get("tool_counts") or {}).items():
+        for name, count in session_tool_counts.items():
             tool_counts[name] += count
         for sc in s.get("slash_commands") or []:
             slash_counter[sc] += 1
@@ -388,37 +407,37 @@ def do_aggregate(extracted_dir: Path, out_path: Path) -> None:
             hook_counter[hook] += count
         outcome_counter[s.get("outcome_hint") or "unknown"] += 1
 
-        cwd = s.get("project_cwd") or "unknown"
-        per_project[cwd]["sessions"] += 1
-        per_project[cwd]["tool_uses"] += sum(s.get("tool_counts", {}).values())
-        per_project[cwd]["errors"] += len(s.get("tool_errors", []))
-        per_project[cwd]["corrections"] += len(s.get("correction_markers", []))
-        per_project[cwd]["duration_s"] += s.get("duration_s") or 0
+        project = per_project[s.get("project_cwd") or "unknown"]
+        project["sessions"] += 1
+        project["tool_uses"] += session_tool_uses
+        project["errors"] += session_errors
+        project["corrections"] += session_corrections
+        project["duration_s"] += session_duration
 
         seq = s.get("tool_sequence") or []
         for a, b in zip(seq, seq[1:]):
             bigram_counter[f"{a} -> {b}"] += 1
 
         fp_txt = (s.get("user_prompts") or [{}])[0].get("text") if s.get("user_prompts") else None
-        if fp_txt:
+        if fp_txt and len(first_prompts) < 80:
             first_prompts.append(fp_txt)
 
-        for cm in s.get("correction_markers") or []:
+        for cm in (s.get("correction_markers") or [])[: 40 - len(correction_samples)]:
             correction_samples.append({**cm, "session_id": s["session_id"]})
-        for fm in s.get("friction_markers") or []:
+        for fm in (s.get("friction_markers") or [])[: 40 - len(friction_samples)]:
             friction_samples.append({**fm, "session_id": s["session_id"]})
 
-        if len(s.get("tool_errors") or []) >= 3:
+        if session_errors >= 3:
             high_error_sessions.append(
                 {
                     "session_id": s["session_id"],
                     "path": s["path"],
-                    "errors": len(s.get("tool_errors") or []),
+                    "errors": session_errors,
                     "tool_counts": s.get("tool_counts"),
                     "first_prompt": fp_txt[:200] if fp_txt else None,
                 }
             )
-        if s.get("outcome_hint") == "likely_abandoned":
+        if s.get("outcome_hint") == "likely_abandoned" and len(likely_abandoned) < 20:
             likely_abandoned.append(
                 {
                     "session_id": s["session_id"],
@@ -461,13 +480,13 @@ def do_aggregate(extracted_dir: Path, out_path: Path) -> None:
                 per_project.items(), key=lambda kv: -kv[1]["sessions"]
             )[:20]
         },
-        "correction_samples": correction_samples[:40],
-        "friction_samples": friction_samples[:40],
+        "correction_samples": correction_samples,
+        "friction_samples": friction_samples,
         "high_error_sessions": sorted(
             high_error_sessions, key=lambda r: -r["errors"]
         )[:20],
-        "likely_abandoned_sessions": likely_abandoned[:20],
-        "first_prompt_samples": first_prompts[:80],
+        "likely_abandoned_sessions": likely_abandoned,
+        "first_prompt_samples": first_prompts,
     }
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -486,13 +505,22 @@ def main() -> int:
     parser.add_argument("--sample", help="path to sample.json (per-session mode)")
     parser.add_argument("--aggregate", help="path to extracted/ dir (aggregation mode)")
     parser.add_argument("--out", required=True, help="output path (dir for extract, file for aggregate)")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="worker processes for per-session mode (default: CPU count)",
+    )
     args = parser.parse_args()
 
     if args.sample and args.aggregate:
         print("error: pick one of --sample / --aggregate", file=sys.stderr)
         return 2
+    if args.jobs is not None and args.jobs < 1:
+        print("error: --jobs must be at least 1", file=sys.stderr)
+        return 2
     if args.sample:
-        do_extract(Path(args.sample), Path(args.out))
+        do_extract(Path(args.sample), Path(args.out), args.jobs)
         return 0
     if args.aggregate:
         do_aggregate(Path(args.aggregate), Path(args.out))
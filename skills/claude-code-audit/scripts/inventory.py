@@ -37,8 +37,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -50,9 +52,28 @@ def decode_project_cwd(project_key: str) -> str:
     return "/" + project_key[1:].replace("-", "/")
 
 
+def list_session_paths(projects_dir: Path) -> list[Path]:
+    """Sorted */*.jsonl session files via two scandir passes; unreadable project dirs are skipped."""
+    paths: list[Path] = []
+    with os.scandir(projects_dir) as projects:
+        for project in projects:
+            if not project.is_dir():
+                continue
+            try:
+                with os.scandir(project.path) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".jsonl") and entry.is_file():
+                            paths.append(Path(entry.path))
+            except OSError as e:
+                print(f"warn: could not list {project.path}: {e}", file=sys.stderr)
+    paths.sort()
+    return paths
+
+
 def scan_session(path: Path) -> dict | None:
-    size = path.stat().st_size
-    mtime = path.stat().st_mtime
+    st = path.stat()
+    size = st.st_size
+    mtime = st.st_mtime
     line_count = 0
     user_turns = 0
     assistant_turns = 0
@@ -72,8 +93,7 @@ def scan_session(path: Path) -> dict | None:
         with path.open("r", encoding="utf-8") as f:
             for line in f:
                 line_count += 1
-                line = line.strip()
-                if not line:
+                if line.isspace():
                     continue
                 try:
                     obj = json.loads(line)
@@ -111,7 +131,7 @@ def scan_session(path: Path) -> dict | None:
                                 if text and not text.startswith("<"):
                                     user_turns += 1
                     elif isinstance(content, str):
-                        if content.startswith("<local-command") or content.startswith("<command-"):
+                        if content.startswith(("<local-command", "<command-")):
                             continue
                         if first_user_prompt is None and content:
                             first_user_prompt = content[:400]
@@ -185,8 +205,23 @@ def main() -> int:
         default=1,
         help="skip sessions with fewer real user prompts than this (default: 1)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="worker processes for scanning sessions (default: CPU count)",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="indent inventory JSON for reading (default: compact)",
+    )
     args = parser.parse_args()
 
+    if args.jobs is not None and args.jobs < 1:
+        print("error: --jobs must be at least 1", file=sys.stderr)
+        return 2
+
     projects_dir = Path(args.projects_dir)
     if not projects_dir.is_dir():
         print(f"error: {projects_dir} is not a directory", file=sys.stderr)
@@ -195,23 +230,29 @@ def main() -> int:
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
+    session_paths = list_session_paths(projects_dir)
     sessions: list[dict] = []
-    for session_path in sorted(projects_dir.glob("*/*.jsonl")):
-        rec = scan_session(session_path)
-        if rec is None:
-            continue
-        if rec["user_turns"] < args.min_user_turns:
-            continue
-        sessions.append(rec)
+    total_tool_uses = 0
+    total_tokens_out = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for rec in pool.map(scan_session, session_paths, chunksize=16):
+            if rec is None:
+                continue
+            if rec["user_turns"] < args.min_user_turns:
+                continue
+            sessions.append(rec)
+            total_tool_uses += rec["tool_uses"]
+            total_tokens_out += rec["output_tokens"]
 
     sessions.sort(key=lambda r: r["mtime"], reverse=True)
-
-    out_path.write_text(json.dumps(sessions, indent=2))
-
-    total_tool_uses = sum(s["tool_uses"] for s in sessions)
-    total_tokens_out = sum(s["output_tokens"] for s in sessions)
+    # Built after the sort so ties in "top projects" list the most recent first.
     projects = Counter(s["project_key"] for s in sessions)
 
+    if args.pretty:
+        out_path.write_text(json.dumps(sessions, indent=2))
+    else:
+        out_path.write_text(json.dumps(sessions, separators=(",", ":")))
+
     print(f"wrote {out_path}")
     print(f"  sessions: {len(sessions)}")
     print(f"  projects: {len(projects)}")
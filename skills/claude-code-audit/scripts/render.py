@@ -40,8 +40,7 @@ def render(path: Path, max_chars: int) -> str:
 
     with path.open("r", encoding="utf-8") as f:
         for raw in f:
-            raw = raw.strip()
-            if not raw:
+            if raw.isspace():
                 continue
             try:
                 obj = json.loads(raw)
@@ -71,7 +70,8 @@ def render(path: Path, max_chars: int) -> str:
                 if event or hook_name:
                     tag = f"[hook {event}:{hook_name} exit={exit_code}]"
                     stdout = att.get("stdout", "") or ""
-                    tail = clip(stdout.strip().splitlines()[-1] if stdout.strip() else "", 120)
+                    stdout_lines = stdout.strip().splitlines()
+                    tail = clip(stdout_lines[-1] if stdout_lines else "", 120)
                     lines.append(f"{tag} {tail}".rstrip())
                 continue
 
@@ -85,11 +85,7 @@ def render(path: Path, max_chars: int) -> str:
                 msg = obj.get("message", {})
                 content = msg.get("content", "")
                 if isinstance(content, str):
-                    if (
-                        content.startswith("<local-command")
-                        or content.startswith("<command-")
-                        or content.startswith("<bash-input>")
-                    ):
+                    if content.startswith(("<local-command", "<command-", "<bash-input>")):
                         continue
                     lines.append(f"\n=== USER ===\n{clip(content, max_chars)}")
                 elif isinstance(content, list):